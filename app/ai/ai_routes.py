@@ -1,19 +1,18 @@
 from fastapi import APIRouter, Depends, HTTPException, UploadFile, File
 from typing import List, Dict, Any
 from app.schemas import FactOut, ChatRequest, ClassifyRequest, NutritionResult
-from app.ai.retriever import retrieve_facts
 from app.ai_pipeline.nutrition_engine import classify_food
-from app.ai_pipeline.llm_integration import get_llm_explanation, chat_with_llm
-from app.ai_pipeline.enhanced_image_recognition import identify_food_from_image
-from app.ai_pipeline.barcode_scanner import scan_barcode_from_image
 from app.ai_pipeline.sugar_analysis import analyze_sugar_composition
 from app.crud import get_user_profile, get_user_goals
 from app.database import get_db
 from sqlalchemy.orm import Session
-from app.services.food_search import search_food_by_name
+from functools import lru_cache
 import logging
-from app.ai_pipeline.enhanced_image_recognition import food_recognizer
 import os
+import time
+
+# Retrieval, LLM, vision and barcode modules load models/native libs at import time,
+# so they are imported inside the handlers that need them to keep app startup light.
 
 router = APIRouter(prefix="/ai", tags=["AI"])
 
@@ -26,8 +25,13 @@ ACTIVITY_LEVEL_MAPPING = {
     "high": 3,
 }
 
+# Load balancer probes can hit /ai/health/ many times a second; reuse one snapshot per window
+HEALTH_CACHE_SECONDS = 1.0
+
 @router.get("/get-nutrition-facts/", response_model=List[FactOut])
 def get_nutrition_facts(q: str, k: int = 3):
+    from app.ai.retriever import retrieve_facts
+
     results = retrieve_facts(query=q, k=k)
     # results already have keys: score, fact, meta
     return results
@@ -55,6 +59,8 @@ def classify_food_endpoint(request: ClassifyRequest, db: Session = Depends(get_d
                 raise HTTPException(status_code=400, detail=f"Incomplete user goal data: '{attr}' is missing.")
         print(f"DEBUG: Goal validation passed")
 
+    from app.services.food_search import search_food_by_name
+
     # Try external API first, fallback to our database
     food_data = search_food_by_name(request.food_name)
     print(f"DEBUG: External food search result: {bool(food_data)}")
@@ -62,6 +68,7 @@ def classify_food_endpoint(request: ClassifyRequest, db: Session = Depends(get_d
     if not food_data or not food_data.get("products"):
         print(f"DEBUG: External search failed, trying built-in database")
         # Fallback to our built-in nutrition database
+        from app.ai_pipeline.enhanced_image_recognition import food_recognizer
         food_key = request.food_name.lower().replace(' ', '_')
         if food_key in food_recognizer.nutrition_db:
             nutrition = food_recognizer.nutrition_db[food_key]
@@ -108,7 +115,9 @@ def classify_food_endpoint(request: ClassifyRequest, db: Session = Depends(get_d
     return classification
 
 @router.post("/generate-explanation/")
-def generate_explanation_endpoint(classification: Dict[str, Any], rag_output: str):
+def generate_explanation_endpoint(classification: Dict[str, Any], rag_output: str) -> Dict[str, str]:
+    from app.ai_pipeline.llm_integration import get_llm_explanation
+
     explanation = get_llm_explanation(classification, rag_output)
     return {"explanation": explanation}
 
@@ -130,7 +139,7 @@ def chat_endpoint(request: ChatRequest, db: Session = Depends(get_db)):
         raise HTTPException(status_code=500, detail="Chat service temporarily unavailable")
 
 @router.post("/identify-food/")
-async def identify_food(file: UploadFile = File(...)):
+def identify_food(file: UploadFile = File(...)):
     """Enhanced food identification with complete nutrition data"""
     try:
         print(f"🚀 API Route: Processing file: {file.filename}")
@@ -153,9 +162,10 @@ async def identify_food(file: UploadFile = File(...)):
         raise HTTPException(status_code=500, detail=f"Recognition failed: {str(e)}")
 
 @router.post("/scan-barcode/")
-async def scan_barcode(file: UploadFile = File(...)):
+def scan_barcode(file: UploadFile = File(...)):
     """Scan barcode from image and lookup nutritional information"""
     try:
+        from app.ai_pipeline.barcode_scanner import scan_barcode_from_image
         result = scan_barcode_from_image(file)
         return result
     except Exception as e:
@@ -207,3 +217,37 @@ def test_google_vision_status():
         "vision_client_initialized": food_recognizer.vision_client is not None,
         "credentials_file_exists": os.path.exists("analog-reef-470415-q6-b8ddae1e11b3.json")
     }
+
+@lru_cache(maxsize=1)
+def _service_snapshot(bucket: int) -> Dict[str, bool]:
+    """Probe the AI services once per HEALTH_CACHE_SECONDS bucket."""
+    import requests
+    from app.ai.llm_integration import OLLAMA_BASE_URL
+    from app.ai_pipeline import random_forest
+
+    index_path = os.getenv("FAISS_INDEX_PATH", "app/indexes/nutrition.index")
+    try:
+        llm_available = requests.get(f"{OLLAMA_BASE_URL}/api/tags", timeout=1).status_code == 200
+    except requests.exceptions.RequestException:
+        llm_available = False
+
+    services = {
+        "retriever": os.path.exists(index_path) and os.path.exists("app/indexes/metadata.jsonl"),
+        # Same files random_forest.load_model() serves from: the export, else the joblib dump
+        "rf_model": os.path.exists(random_forest.SAFE_MODEL_PATH) or (
+            os.path.exists(random_forest.MODEL_PATH) and os.path.exists(random_forest.SCALER_PATH)
+        ),
+        "llm_service": llm_available,
+    }
+    services["overall"] = all(services.values())
+    return services
+
+@router.get("/health/")
+def health_check():
+    """Report availability of the retriever, RF model and LLM service."""
+    services = dict(_service_snapshot(int(time.monotonic() / HEALTH_CACHE_SECONDS)))
+    return {
+        "status": "healthy" if services["overall"] else "degraded",
+        "services": services,
+        "timestamp": time.time(),
+    }
@@ -2,38 +2,126 @@
 import json
 import numpy as np
 import faiss
-from sentence_transformers import SentenceTransformer
 import os
+import math
+from functools import lru_cache
+from itertools import islice
+from typing import TYPE_CHECKING, Any, Dict, Iterable, List, Optional
 
-def build_faiss_index(jsonl_path: str, model_name: str, index_path: str, embeddings_path: str, metadata_path: str):
+if TYPE_CHECKING:
+    from sentence_transformers import SentenceTransformer
+
+# Texts per forward pass when encoding facts
+ENCODE_BATCH_SIZE = 64
+
+# Corpus sizes at which indexing switches from exact search to IVF, and from IVF to IVF-PQ
+IVF_THRESHOLD = 10_000
+IVFPQ_THRESHOLD = 100_000
+
+@lru_cache(maxsize=4)
+def load_embedding_model(model_name: str) -> "SentenceTransformer":
+    """
+    Loads a sentence transformer once per model name and shares it between callers.
+    The returned model is shared, so treat it as read-only (no .train() or fine-tuning).
+    """
+    # Imported here so index building/reading works without the model stack installed
+    from sentence_transformers import SentenceTransformer
+
+    return SentenceTransformer(model_name)
+
+def load_facts(path: str, limit: Optional[int] = None) -> List[Dict[str, Any]]:
     """
-    Builds a FAISS index from the fact text in a JSONL file.
+    Loads fact records from a Parquet file, or from JSONL (the legacy format).
+    """
+    if path.endswith(".parquet"):
+        import pyarrow.parquet as pq
+
+        table = pq.read_table(path)
+        if limit is not None:
+            table = table.slice(0, limit)
+        return table.to_pylist()
+
+    with open(path, "r") as f:
+        return [json.loads(line) for line in islice(f, limit)]
+
+def read_index(index_path: str, mmap: bool = True) -> faiss.Index:
+    """
+    Reads a FAISS index from disk. With mmap the file is memory-mapped read-only, so
+    the OS pages IVF lists in on demand instead of copying the whole index into RAM
+    (flat indexes are still read in full).
+    """
+    flags = faiss.IO_FLAG_MMAP | faiss.IO_FLAG_READ_ONLY if mmap else 0
+    return faiss.read_index(index_path, flags)
+
+def _use_gpu(device: str) -> bool:
+    """True if device allows it ("auto" or "cuda") and the faiss build can see a GPU."""
+    return device != "cpu" and faiss.get_num_gpus() > 0
+
+def _build_index(vectors: np.ndarray, nprobe: int = 8, device: str = "auto", index_type: str = "auto") -> faiss.Index:
+    """
+    Builds an inner-product index. index_type "auto" sizes it to the corpus: exact search
+    ("flat") for small corpora, IVF with sqrt(n) lists ("ivf") from IVF_THRESHOLD, and
+    product-quantized IVF ("ivfpq", ~4 dims per 8-bit code) from IVFPQ_THRESHOLD.
+    nprobe is the number of IVF lists scanned per query (recall vs. latency).
+    With a GPU available the index is trained and filled on all GPUs; pass it through
+    faiss.index_gpu_to_cpu before writing it to disk.
+    """
+    n, d = vectors.shape
+    if index_type == "auto":
+        index_type = "flat" if n < IVF_THRESHOLD else "ivf" if n < IVFPQ_THRESHOLD else "ivfpq"
+
+    if index_type == "flat":
+        index = faiss.IndexFlatIP(d)
+    elif index_type in ("ivf", "ivfpq"):
+        nlist = int(math.sqrt(n))
+        quantizer = faiss.IndexFlatIP(d)
+        if index_type == "ivf":
+            index = faiss.IndexIVFFlat(quantizer, d, nlist, faiss.METRIC_INNER_PRODUCT)
+        else:
+            # Sub-quantizer count must divide the dimension; aim for ~4 dims per code
+            m = next(m for m in range(max(d // 4, 1), 0, -1) if d % m == 0)
+            index = faiss.IndexIVFPQ(quantizer, d, nlist, m, 8, faiss.METRIC_INNER_PRODUCT)
+        index.nprobe = nprobe
+    else:
+        raise ValueError(f"Unknown index_type: {index_type}")
+
+    if _use_gpu(device):
+        index = faiss.index_cpu_to_all_gpus(index)
+    if not index.is_trained:
+        index.train(vectors)
+    index.add(vectors)
+    return index
+
+def build_faiss_index_from_records(records: Iterable[Dict[str, Any]], model_name: str, index_path: str, embeddings_path: str, metadata_path: str, nprobe: int = 8, device: str = "auto", index_type: str = "auto"):
+    """
+    Builds a FAISS index from in-memory fact records ({"fact_text": ..., "meta": {...}}).
     """
     if not os.path.exists(os.path.dirname(index_path)):
         os.makedirs(os.path.dirname(index_path))
 
     # Load the sentence transformer model
-    model = SentenceTransformer(model_name)
+    model = load_embedding_model(model_name)
 
-    # Read the fact texts and metadata from the JSONL file
     fact_texts = []
     metadata = []
-    with open(jsonl_path, "r") as f:
-        for line in f:
-            data = json.loads(line)
-            fact_texts.append(data["fact_text"])
-            metadata.append(data["meta"])
+    for data in records:
+        fact_texts.append(data["fact_text"])
+        metadata.append(data["meta"])
 
-    # Encode the fact texts into embeddings
+    # Encode all fact texts in one batched call, normalized to unit length
     print("Encoding fact texts...")
-    embeddings = model.encode(fact_texts, convert_to_numpy=True, show_progress_bar=True)
-
-    # Normalize the embeddings to unit length
-    faiss.normalize_L2(embeddings)
+    embeddings = model.encode(
+        fact_texts,
+        batch_size=ENCODE_BATCH_SIZE,
+        convert_to_numpy=True,
+        normalize_embeddings=True,
+        show_progress_bar=False,
+    )
 
     # Build the FAISS index
-    index = faiss.IndexFlatIP(embeddings.shape[1])
-    index.add(embeddings)
+    index = _build_index(embeddings, nprobe, device, index_type)
+    if _use_gpu(device):
+        index = faiss.index_gpu_to_cpu(index)
 
     # Save the index, embeddings, and metadata
     print(f"Saving FAISS index to {index_path}")
@@ -48,3 +136,10 @@ def build_faiss_index(jsonl_path: str, model_name: str, index_path: str, embeddi
             f.write(json.dumps(m) + "\n")
 
     print("Index building complete.")
+
+def build_faiss_index(jsonl_path: str, model_name: str, index_path: str, embeddings_path: str, metadata_path: str, nprobe: int = 8, device: str = "auto", index_type: str = "auto"):
+    """
+    Builds a FAISS index from the fact text in a JSONL (or Parquet) file.
+    """
+    records = load_facts(jsonl_path)
+    build_faiss_index_from_records(records, model_name, index_path, embeddings_path, metadata_path, nprobe, device, index_type)
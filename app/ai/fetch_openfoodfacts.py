@@ -93,8 +93,11 @@ def seed_data(seed_terms: list[str]):
                     f.write(json.dumps({"fact_text": fact_text, "meta": normalized}) + "\n")
                     print(f"Cached: {fact_text}")
 
-    # Cache to SQLite
+    # Cache to SQLite; WAL with synchronous=NORMAL avoids an fsync per commit
     conn = sqlite3.connect("data/app.db")
+    conn.execute("PRAGMA journal_mode=WAL")
+    conn.execute("PRAGMA synchronous=NORMAL")
+    conn.execute("PRAGMA temp_store=MEMORY")
     c = conn.cursor()
     c.execute('''
         CREATE TABLE IF NOT EXISTS foods (
@@ -110,21 +113,22 @@ def seed_data(seed_terms: list[str]):
     ''')
     
     with open("data/nutrition_facts.jsonl", "r") as f:
-        for line in f:
-            data = json.loads(line)
-            meta = data["meta"]
-            c.execute(
-                "INSERT INTO foods (name, barcode, url, calories_100g, protein_100g, carbs_100g, fat_100g) VALUES (?, ?, ?, ?, ?, ?, ?)",
-                (
-                    meta["name"],
-                    meta["barcode"],
-                    meta["url"],
-                    meta["calories_100g"],
-                    meta["protein_100g"],
-                    meta["carbs_100g"],
-                    meta["fat_100g"],
-                ),
+        metas = [json.loads(line)["meta"] for line in f]
+    c.executemany(
+        "INSERT INTO foods (name, barcode, url, calories_100g, protein_100g, carbs_100g, fat_100g) VALUES (?, ?, ?, ?, ?, ?, ?)",
+        [
+            (
+                meta["name"],
+                meta["barcode"],
+                meta["url"],
+                meta["calories_100g"],
+                meta["protein_100g"],
+                meta["carbs_100g"],
+                meta["fat_100g"],
             )
+            for meta in metas
+        ],
+    )
     conn.commit()
     conn.close()
     print("Database seeding complete.")
@@ -4,7 +4,8 @@ from sqlalchemy.orm import Session
 from app.crud import get_user_profile, get_user_goals, get_logs_by_user
 from datetime import date, datetime, timedelta
 
-OLLAMA_URL = "http://localhost:11434/api/generate"
+OLLAMA_BASE_URL = "http://localhost:11434"
+OLLAMA_URL = f"{OLLAMA_BASE_URL}/api/generate"
 MODEL_NAME = "phi3:mini"
 
 def build_user_context(db: Session, user_id: int) -> str:
@@ -2,7 +2,7 @@
 import faiss
 import numpy as np
 import json
-from sentence_transformers import SentenceTransformer
+from app.ai.embeddings import load_embedding_model, read_index
 import os
 from dotenv import load_dotenv
 
@@ -11,12 +11,13 @@ load_dotenv()
 FAISS_INDEX_PATH = os.getenv("FAISS_INDEX_PATH", "app/indexes/nutrition.index")
 EMB_MODEL = os.getenv("EMB_MODEL", "all-MiniLM-L6-v2")
 METADATA_PATH = "app/indexes/metadata.jsonl"
+FAISS_MMAP = os.getenv("FAISS_MMAP", "1") == "1"
 
-# Load the FAISS index
-index = faiss.read_index(FAISS_INDEX_PATH)
+# Load the FAISS index (memory-mapped unless FAISS_MMAP=0)
+index = read_index(FAISS_INDEX_PATH, mmap=FAISS_MMAP)
 
 # Load the sentence transformer model
-model = SentenceTransformer(EMB_MODEL)
+model = load_embedding_model(EMB_MODEL)
 
 # Load the metadata
 metadata = []
@@ -42,7 +43,8 @@ def retrieve_facts(query: str, k: int = 5) -> list[dict]:
     for i in range(k):
         if i < len(indices[0]):
             index_val = indices[0][i]
-            if index_val < len(metadata):
+            # IVF indexes pad with -1 when the probed lists hold fewer than k vectors
+            if 0 <= index_val < len(metadata):
                 # Retrieve fact_text from jsonl file
                 fact_text = ""
                 with open("data/nutrition_facts.jsonl", "r") as f:
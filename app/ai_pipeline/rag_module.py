@@ -2,11 +2,11 @@
 import json
 import faiss
 import numpy as np
-from sentence_transformers import SentenceTransformer
+from app.ai.embeddings import ENCODE_BATCH_SIZE, load_embedding_model
 
 class RAGModule:
     def __init__(self, data_path='data/nutrition_facts.jsonl', index_path='app/indexes/nutrition.index'):
-        self.model = SentenceTransformer('all-MiniLM-L6-v2')
+        self.model = load_embedding_model('all-MiniLM-L6-v2')
         self.data_path = data_path
         self.index_path = index_path
         self.documents = []
@@ -23,19 +23,27 @@ class RAGModule:
         try:
             self.index = faiss.read_index(self.index_path)
         except RuntimeError:
-            embeddings = self.model.encode([doc['fact_text'] for doc in self.documents], convert_to_tensor=True)
-            embeddings = embeddings.cpu().numpy()
-            self.index = faiss.IndexFlatL2(embeddings.shape[1])
+            embeddings = self.model.encode(
+                [doc['fact_text'] for doc in self.documents],
+                batch_size=ENCODE_BATCH_SIZE,
+                convert_to_numpy=True,
+                normalize_embeddings=True,
+                show_progress_bar=False,
+            )
+            # Cosine similarity as inner product over unit vectors, same as build_faiss_index
+            self.index = faiss.IndexFlatIP(embeddings.shape[1])
             self.index.add(embeddings)
             faiss.write_index(self.index, self.index_path)
 
     def retrieve(self, query: str, k: int = 3):
-        query_embedding = self.model.encode([query], convert_to_tensor=True)
-        query_embedding = query_embedding.cpu().numpy()
+        query_embedding = self.model.encode([query], convert_to_numpy=True, normalize_embeddings=True)
         distances, indices = self.index.search(query_embedding, k)
         
         results = []
         for i, idx in enumerate(indices[0]):
+            # IVF indexes pad with -1 when the probed lists hold fewer than k vectors
+            if idx < 0:
+                continue
             doc = self.documents[idx]
             results.append({
                 "score": float(distances[0][i]),
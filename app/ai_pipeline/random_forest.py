@@ -1,6 +1,9 @@
 
 from typing import List, Any
+from functools import lru_cache
+import hashlib
 
+import numpy as np
 import pandas as pd
 from sklearn.ensemble import RandomForestClassifier
 from sklearn.model_selection import train_test_split
@@ -40,14 +43,126 @@ def train_model():
     model.fit(X_train, y_train)
 
     # Ensure the directory exists
-    os.makedirs(os.path.dirname('models/rf_model.joblib'), exist_ok=True)
+    os.makedirs(os.path.dirname(MODEL_PATH), exist_ok=True)
     
-    joblib.dump(model, 'models/rf_model.joblib')
-    joblib.dump(scaler, 'models/scaler.joblib')
+    joblib.dump(model, MODEL_PATH)
+    joblib.dump(scaler, SCALER_PATH)
+    save_model_safe(model, scaler, source_path=MODEL_PATH)
+    load_model.cache_clear()
+
+LABEL_COLUMNS = ('calories_100g', 'protein_100g', 'carbs_100g', 'fat_100g')
+
+def add_labels(facts, rule, columns=LABEL_COLUMNS):
+    """
+    Sets fact["recommended"] (0/1) in place for every fact using a vectorized rule.
+    `rule` receives a dict of float32 column arrays (missing values read as 0) and
+    returns a boolean array, e.g. lambda c: c["protein_100g"] > 10.
+    """
+    cols = {
+        name: np.fromiter((fact.get(name, 0) for fact in facts), dtype=np.float32, count=len(facts))
+        for name in columns
+    }
+    labels = np.asarray(rule(cols)).astype(np.int8)
+    for fact, label in zip(facts, labels.tolist()):
+        fact['recommended'] = label
+    return facts
+
+MODEL_PATH = 'models/rf_model.joblib'
+SCALER_PATH = 'models/scaler.joblib'
+SAFE_MODEL_PATH = 'models/rf_model.npz'
+
+def _file_sha256(path):
+    with open(path, 'rb') as f:
+        return hashlib.sha256(f.read()).hexdigest()
+
+def _flatten_forest(model, scaler):
+    """
+    The forest and scaler as plain numeric arrays, the layout predict_proba_safe() scores.
+    All trees are flattened into one node table; child indices point into that table.
+    """
+    trees = [estimator.tree_ for estimator in model.estimators_]
+    offsets = np.cumsum([0] + [tree.node_count for tree in trees])
+
+    def children(side, offset):
+        # Leaves keep -1, internal nodes are shifted into the flattened table
+        return np.where(side == -1, -1, side + offset)
+
+    value = np.concatenate([tree.value[:, 0, :] for tree in trees])
+    return {
+        "roots": offsets[:-1],
+        "children_left": np.concatenate([children(t.children_left, o) for t, o in zip(trees, offsets)]),
+        "children_right": np.concatenate([children(t.children_right, o) for t, o in zip(trees, offsets)]),
+        "feature": np.concatenate([tree.feature for tree in trees]),
+        "threshold": np.concatenate([tree.threshold for tree in trees]),
+        "value": value / value.sum(axis=1, keepdims=True),
+        "classes": model.classes_,
+        "scaler_mean": scaler.mean_,
+        "scaler_scale": scaler.scale_,
+    }
+
+def save_model_safe(model, scaler, path=SAFE_MODEL_PATH, source_path=None):
+    """
+    Saves the forest and scaler without pickle, so the file can be loaded safely with
+    load_model_safe() and scored with predict_proba_safe().
+    source_path is the joblib dump of the same model; its checksum is stored so
+    load_model() can tell when the export has gone stale.
+    """
+    arrays = _flatten_forest(model, scaler)
+    if source_path is not None:
+        arrays["source_sha256"] = np.array(_file_sha256(source_path))
+    np.savez(path, **arrays)
+
+def load_model_safe(path=SAFE_MODEL_PATH):
+    """Load arrays written by save_model_safe(); refuses pickled objects."""
+    with np.load(path, allow_pickle=False) as data:
+        return {key: data[key] for key in data.files}
+
+def predict_proba_safe(forest, X):
+    """Class probabilities for unscaled X from a forest loaded with load_model_safe()."""
+    X = ((np.asarray(X, dtype=np.float64) - forest["scaler_mean"]) / forest["scaler_scale"]).astype(np.float32)
+    rows = np.arange(len(X))[:, None]
+    node = np.tile(forest["roots"], (len(X), 1))
+    while True:
+        left = forest["children_left"][node]
+        is_leaf = left == -1
+        if is_leaf.all():
+            break
+        go_left = X[rows, forest["feature"][node]] <= forest["threshold"][node]
+        node = np.where(is_leaf, node, np.where(go_left, left, forest["children_right"][node]))
+    return forest["value"][node].mean(axis=1)
+
+@lru_cache(maxsize=1)
+def load_model():
+    """
+    Load the trained forest once per process, as arrays for predict_proba_safe().
+    Reads the pickle-free SAFE_MODEL_PATH. The joblib dump is only unpickled (and
+    converted in memory) when there is no export, or when the export was made from
+    a different joblib dump than the one now in MODEL_PATH.
+    """
+    if os.path.exists(SAFE_MODEL_PATH):
+        forest = load_model_safe(SAFE_MODEL_PATH)
+        if not os.path.exists(MODEL_PATH) or str(forest.get("source_sha256", "")) == _file_sha256(MODEL_PATH):
+            return forest
+        print(f"WARNING: {SAFE_MODEL_PATH} is stale for {MODEL_PATH}; serving the joblib model until it is re-exported")
+    return _flatten_forest(joblib.load(MODEL_PATH), joblib.load(SCALER_PATH))
+
+# Column order the model was trained with; must match the features used in train_model exactly
+FEATURE_COLUMNS = (
+    'calories', 'protein', 'fat', 'sugar', 'carbohydrates',
+    'age', 'bmi', 'activity_level',
+    'target_calories', 'target_protein', 'target_carbs', 'target_fats'
+)
+
+def _build_feature_vector(features):
+    """One-row float64 matrix of the model features, in FEATURE_COLUMNS order."""
+    return np.array([[features[name] for name in FEATURE_COLUMNS]], dtype=np.float64)
+
+def predict_batch(X):
+    """Class probabilities for an (n, len(FEATURE_COLUMNS)) matrix of unscaled features."""
+    return predict_proba_safe(load_model(), X)
 
 def classify_food(food_features, user_features, user_goals: List[Any]):
-    model = joblib.load('models/rf_model.joblib')
-    scaler = joblib.load('models/scaler.joblib')
+    forest = load_model()
 
     # Define default nutritional targets
     DEFAULT_TARGETS = {
@@ -81,23 +196,8 @@ def classify_food(food_features, user_features, user_goals: List[Any]):
     print(f"DEBUG: goal_features = {goal_features}")
     print(f"DEBUG: final features dict = {features}")
 
-    df = pd.DataFrame([features])
-    print(f"DEBUG: DataFrame columns = {df.columns.tolist()}")
-    print(f"DEBUG: DataFrame shape = {df.shape}")
-
-    # Ensure the order of columns is the same as during training
-    # This list must match the features used in train_model exactly
-    expected_columns = [
-        'calories', 'protein', 'fat', 'sugar', 'carbohydrates',
-        'age', 'bmi', 'activity_level',
-        'target_calories', 'target_protein', 'target_carbs', 'target_fats'
-    ]
-    df = df[expected_columns]
-
-    scaled_features = scaler.transform(df)
-    
-    prediction = model.predict(scaled_features)
-    probability = model.predict_proba(scaled_features)
+    probability = predict_batch(_build_feature_vector(features))
+    prediction = forest["classes"].take(np.argmax(probability, axis=1))
 
     # Calculate nutritional reasoning for LLM explanation
     calories = food_features.get('calories', 0)
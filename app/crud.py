@@ -2,7 +2,7 @@ from sqlalchemy.orm import Session, joinedload
 from sqlalchemy import func
 # Remove: from fastapi import HTTPException
 from . import models, schemas
-from .utils import calculate_targets
+from .utils import compute_targets
 from datetime import date
 from typing import Optional
 from pydantic import BaseModel
@@ -18,29 +18,29 @@ def create_user_profile(db: Session, profile: schemas.UserProfileCreate):
         activity_level=profile.activity_level,
         goal=profile.goal,
     )
+    _store_targets(db_profile)
+
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
+    return db_profile
 
-    cals, protein, carbs, fats = calculate_targets(db, db_profile.id)
+def _store_targets(db_profile: models.UserProfile):
+    """Persist computed nutrition targets on the profile row so reads don't recompute them."""
+    cals, protein, carbs, fats = compute_targets(db_profile)
     db_profile.target_calories = cals
     db_profile.target_protein = protein
     db_profile.target_carbs = carbs
     db_profile.target_fats = fats
 
-    db.add(db_profile)
-    db.commit()
-    db.refresh(db_profile)
-    return db_profile
-
 def get_user_profile(db: Session, user_id: int):
-    profile = db.query(models.UserProfile).filter(models.UserProfile.id == user_id).first()
+    profile = db.get(models.UserProfile, user_id)
     if not profile:
         raise ValueError(f"User profile {user_id} not found")
     return profile
 
 def get_user_profile_by_id(db: Session, user_id: int):
-    return db.query(models.UserProfile).filter(models.UserProfile.id == user_id).first()
+    return db.get(models.UserProfile, user_id)
 
 
 def get_user_profiles(db: Session, skip: int = 0, limit: int = 100):
@@ -54,6 +54,9 @@ def update_user_profile(db: Session, user_id: int, profile: schemas.UserProfileC
     for var, value in vars(profile).items():
         setattr(db_profile, var, value) if value else None
 
+    # Profile inputs may have changed, so refresh the stored targets
+    _store_targets(db_profile)
+
     db.add(db_profile)
     db.commit()
     db.refresh(db_profile)
@@ -82,7 +85,7 @@ def get_foods(db: Session, skip: int = 0, limit: int = 100):
     return db.query(models.Food).offset(skip).limit(limit).all()
 
 def get_food(db: Session, food_id: int):
-    return db.query(models.Food).filter(models.Food.id == food_id).first()
+    return db.get(models.Food, food_id)
 
 def get_food_by_name(db: Session, food_name: str):
     return db.query(models.Food).filter(models.Food.name == food_name).first()
@@ -90,26 +93,20 @@ def get_food_by_name(db: Session, food_name: str):
 # ---------- Daily Logs ----------
 def create_daily_log(db: Session, log: schemas.DailyLogCreate):
     # Check if food_id exists
-    food = db.query(models.Food).filter(models.Food.id == log.food_id).first()
+    food = db.get(models.Food, log.food_id)
     if not food:
         raise ValueError(f"Food with ID {log.food_id} not found")
 
     # Check if user_id exists
-    user = db.query(models.UserProfile).filter(models.UserProfile.id == log.user_id).first()
+    user = db.get(models.UserProfile, log.user_id)
     if not user:
         raise ValueError(f"User with ID {log.user_id} not found")
 
-    # Parse the date string to date object
-    try:
-        log_date = date.fromisoformat(log.date)
-    except ValueError:
-        raise ValueError(f"Invalid date format: {log.date}. Expected yyyy-MM-dd")
-
     # Check for duplicate log (same user, food, date)
     existing_log = db.query(models.DailyLog).filter(
         models.DailyLog.user_id == log.user_id,
         models.DailyLog.food_id == log.food_id,
-        models.DailyLog.date == log_date
+        models.DailyLog.date == log.date
     ).first()
     
     if existing_log:
@@ -120,7 +117,7 @@ def create_daily_log(db: Session, log: schemas.DailyLogCreate):
         return existing_log
 
     db_log = models.DailyLog(
-        date=log_date,
+        date=log.date,
         quantity=log.quantity,
         user_id=log.user_id,
         food_id=log.food_id
@@ -130,7 +127,7 @@ def create_daily_log(db: Session, log: schemas.DailyLogCreate):
     db.refresh(db_log)
     return db_log
 
-def get_logs_by_date(db: Session, date: str):
+def get_logs_by_date(db: Session, date: date):
     return db.query(models.DailyLog).filter(models.DailyLog.date == date).options(joinedload(models.DailyLog.food)).all()
 
 def get_all_logs(db: Session):
@@ -147,13 +144,13 @@ def get_logs_by_user(db: Session, user_id: int, limit: int = 5):
         .all()
     )
 
-def get_logs_by_date_and_user(db: Session, user_id: int, date: str):
+def get_logs_by_date_and_user(db: Session, user_id: int, date: date):
     return db.query(models.DailyLog).filter(
         models.DailyLog.user_id == user_id,
         models.DailyLog.date == date
     ).options(joinedload(models.DailyLog.food)).all()
 
-def get_daily_totals(db: Session, date: str):
+def get_daily_totals(db: Session, date: date):
     totals = (
         db.query(
             func.sum(models.Food.calories * models.DailyLog.quantity).label("calories"),
@@ -182,7 +179,7 @@ def get_daily_totals(db: Session, date: str):
         }
 
 def delete_daily_log(db: Session, log_id: int):
-    db_log = db.query(models.DailyLog).filter(models.DailyLog.id == log_id).first()
+    db_log = db.get(models.DailyLog, log_id)
     if not db_log:
         raise ValueError(f"Log with ID {log_id} not found")
     db.delete(db_log)
@@ -190,7 +187,7 @@ def delete_daily_log(db: Session, log_id: int):
     return {"ok": True}
 
 def update_daily_log(db: Session, log_id: int, log_update: schemas.DailyLogUpdate):
-    db_log = db.query(models.DailyLog).filter(models.DailyLog.id == log_id).first()
+    db_log = db.get(models.DailyLog, log_id)
     if not db_log:
         raise ValueError(f"Log with ID {log_id} not found")
 
@@ -199,7 +196,7 @@ def update_daily_log(db: Session, log_id: int, log_update: schemas.DailyLogUpdat
         db_log.quantity = log_update.quantity
     if log_update.food_id is not None:
         # Check if food_id exists
-        food = db.query(models.Food).filter(models.Food.id == log_update.food_id).first()
+        food = db.get(models.Food, log_update.food_id)
         if not food:
             raise ValueError(f"Food with ID {log_update.food_id} not found")
         db_log.food_id = log_update.food_id
@@ -215,7 +212,7 @@ def update_daily_log(db: Session, log_id: int, log_update: schemas.DailyLogUpdat
     return db_log
 
 def update_goal(db: Session, goal_id: int, goal: schemas.UserGoalUpdate):
-    db_goal = db.query(models.UserGoal).filter(models.UserGoal.id == goal_id).first()
+    db_goal = db.get(models.UserGoal, goal_id)
     if not db_goal:
         raise ValueError(f"Goal with ID {goal_id} not found")
 
@@ -231,7 +228,7 @@ def update_goal(db: Session, goal_id: int, goal: schemas.UserGoalUpdate):
 
 # ---------- User Goals ----------
 def set_goal(db: Session, goal: schemas.UserGoalCreate):
-    db_user = db.query(models.UserProfile).filter(models.UserProfile.id == goal.user_id).first()
+    db_user = db.get(models.UserProfile, goal.user_id)
     if not db_user:
         raise ValueError(f"User {goal.user_id} not found")
     db_goal = models.UserGoal(**goal.dict())
@@ -249,7 +246,7 @@ def get_user_goals(db: Session, user_id: int):
         return []
     return db_goals
 
-def get_daily_totals_by_user(db: Session, user_id: int, date: str):
+def get_daily_totals_by_user(db: Session, user_id: int, date: date):
     """Get daily nutrition totals for a specific user and date."""
     
     # Use select_from to avoid join ambiguity
@@ -9,20 +9,31 @@ logger = logging.getLogger("uvicorn.access")
 logger.setLevel(logging.INFO)
 
 from fastapi import FastAPI, Depends, HTTPException
+from fastapi.responses import Response
+import orjson
 from fastapi.middleware.cors import CORSMiddleware
 from sqlalchemy.orm import Session
 from . import crud, schemas, utils
 from .database import get_db, engine, Base
 from .user_profiles import router as profiles_router
-from app.services.food_search import search_food_by_name
+from app.ai.ai_routes import router as ai_router
 from typing import Optional
+from datetime import date
+from contextlib import asynccontextmanager
+import anyio
 from app.schemas import DailyLogUpdate, UserGoalUpdate
 # from app.routers import chat
 
-# Create DB tables
-Base.metadata.create_all(bind=engine)
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    # Schema creation is a deploy step (python -m app.create_tables); INIT_DB=1 runs it on boot
+    if os.getenv("INIT_DB", "0") == "1":
+        Base.metadata.create_all(bind=engine)
+    # Sync handlers and DB sessions run in AnyIO's worker threads; the default cap is 40
+    anyio.to_thread.current_default_thread_limiter().total_tokens = int(os.getenv("THREADPOOL_SIZE", "100"))
+    yield
 
-app = FastAPI(title="Nutrition API")
+app = FastAPI(title="Nutrition API", lifespan=lifespan)
 
 origins = ["*"]
 
@@ -37,10 +48,8 @@ app.add_middleware(
 # Routers
 app.include_router(profiles_router)
 
-# Gate AI routes to avoid heavy deps in minimal environments/CI
-if os.getenv("ENABLE_AI_ROUTES", "0") == "1":
-    from app.ai.ai_routes import router as ai_router  # import lazily
-    app.include_router(ai_router)
+# AI routes import their heavy deps (FAISS, vision, LLM clients) on first use
+app.include_router(ai_router)
 # app.include_router(chat.router)
 
 # Food endpoints
@@ -55,23 +64,44 @@ def read_foods(skip: int = 0, limit: int = 100, db: Session = Depends(get_db)):
 # Daily Logs
 @app.post("/logs/", response_model=schemas.DailyLog)
 def create_log(log: schemas.DailyLogCreate, db: Session = Depends(get_db)):
-    print(f"DEBUG: Creating log - user_id: {log.user_id}, food_id: {log.food_id}, quantity: {log.quantity}, date: {log.date}")
+    logger.debug("Creating log user_id=%s food_id=%s quantity=%s date=%s", log.user_id, log.food_id, log.quantity, log.date)
     try:
         result = crud.create_daily_log(db=db, log=log)
-        print(f"DEBUG: Log created successfully - id: {result.id}")
+        logger.debug("Log created id=%s", result.id)
         return result
     except ValueError as e:
-        print(f"DEBUG: ValueError in create_log: {e}")
+        logger.debug("ValueError in create_log: %s", e)
         raise HTTPException(status_code=400, detail=str(e))
-    except Exception as e:
-        print(f"DEBUG: Unexpected error in create_log: {e}")
+    except Exception:
+        logger.exception("create_log failed")
         raise HTTPException(status_code=500, detail="Internal server error")
 
-@app.get("/logs/", response_model=list[schemas.DailyLog])
-def read_logs(user_id: int, log_date: Optional[str] = None, db: Session = Depends(get_db)):
+def _log_to_dict(log):
+    # Mirrors schemas.DailyLog; rows come straight from the DB so Pydantic re-validation is skipped
+    food = log.food
+    return {
+        "id": log.id,
+        "date": log.date,
+        "quantity": log.quantity,
+        "food_id": log.food_id,
+        "user_id": log.user_id,
+        "food": {
+            "id": food.id,
+            "name": food.name,
+            "calories": food.calories,
+            "protein": food.protein,
+            "carbs": food.carbs,
+            "fats": food.fats,
+        } if food else None,
+    }
+
+@app.get("/logs/", response_model=None, responses={200: {"model": list[schemas.DailyLog]}})
+def read_logs(user_id: int, log_date: Optional[date] = None, db: Session = Depends(get_db)):
     if log_date:
-        return crud.get_logs_by_date_and_user(db=db, user_id=user_id, date=log_date)
-    return crud.get_logs_by_user(db=db, user_id=user_id)
+        logs = crud.get_logs_by_date_and_user(db=db, user_id=user_id, date=log_date)
+    else:
+        logs = crud.get_logs_by_user(db=db, user_id=user_id)
+    return Response(orjson.dumps([_log_to_dict(log) for log in logs]), media_type="application/json")
 
 @app.put("/logs/{log_id}", response_model=schemas.DailyLog)
 def update_log(log_id: int, log_update: schemas.DailyLogUpdate, db: Session = Depends(get_db)):
@@ -83,13 +113,15 @@ def delete_log(log_id: int, db: Session = Depends(get_db)):
 
 # Totals
 @app.get("/totals/{user_id}/{log_date}", response_model=schemas.DailyTotals)
-def get_daily_totals(user_id: int, log_date: str, db: Session = Depends(get_db)):
+def get_daily_totals(user_id: int, log_date: date, db: Session = Depends(get_db)):
     # Get actual consumed totals for the specific date
     totals = crud.get_daily_totals_by_user(db, user_id, log_date)
     return schemas.DailyTotals(date=log_date, **totals)
 
 @app.get("/search-food/{food_name}", response_model=dict)
 def search_food(food_name: str):
+    # Imported on first use so app startup doesn't pull in the HTTP client
+    from app.services.food_search import search_food_by_name
     return search_food_by_name(food_name)
 
 # Goals
@@ -26,7 +26,7 @@ class DailyLogBase(BaseModel):
     user_id: int
 
 class DailyLogCreate(DailyLogBase):
-    date: str  # Accept date as string from Flutter
+    date: date  # Flutter sends yyyy-MM-dd; Pydantic parses it (422 on bad input)
 
 class DailyLogUpdate(BaseModel):
     quantity: Optional[float] = None
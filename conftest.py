@@ -0,0 +1,24 @@
+import pytest
+
+
+def pytest_addoption(parser):
+    parser.addoption(
+        "--live-ollama",
+        action="store_true",
+        default=False,
+        help="talk to the real Ollama server instead of a canned response",
+    )
+
+
+@pytest.hookimpl(tryfirst=True)
+def pytest_collection_modifyitems(config, items):
+    # With --dist=loadgroup, every test in one xdist_group is sent to the same worker.
+    # tryfirst: xdist reads the xdist_group markers in its own hook implementation.
+    for item in items:
+        if item.get_closest_marker("serial"):
+            item.add_marker(pytest.mark.xdist_group("serial"))
+
+
+@pytest.fixture
+def live_ollama(request):
+    return request.config.getoption("--live-ollama")
@@ -47,6 +47,10 @@ if [ ! -f "models/random_forest_model.pkl" ]; then
     python backend/ai/train_rf.py --jsonl data/nutrition_facts.jsonl
 fi
 
+# Create database tables
+echo "Creating database tables..."
+python -m app.create_tables
+
 # Start the application
 echo
 echo "Starting FastAPI application..."
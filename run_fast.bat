@@ -4,7 +4,7 @@ echo Windows will open showing the service logs.
 echo.
 
 REM Start FastAPI backend - make window visible and bring to front
-start "FastAPI Backend - API Logs" /MAX cmd /k "cd /d %~dp0 && title FastAPI Backend && echo Activating virtual environment... && .venv\Scripts\activate && echo. && echo Starting FastAPI server on http://127.0.0.1:8000 && echo API logs will appear below: && echo ================================ && uvicorn app.main:app --reload"
+start "FastAPI Backend - API Logs" /MAX cmd /k "cd /d %~dp0 && title FastAPI Backend && echo Activating virtual environment... && .venv\Scripts\activate && echo Creating database tables... && python -m app.create_tables && echo. && echo Starting FastAPI server on http://127.0.0.1:8000 && echo API logs will appear below: && echo ================================ && uvicorn app.main:app --reload"
 
 REM Small delay before starting Flutter
 timeout /t 2 /nobreak > nul
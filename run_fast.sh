@@ -1,6 +1,9 @@
 #!/bin/bash
 # Super fast development launcher - runs backend and frontend simultaneously
 
+# Create database tables
+python -m app.create_tables
+
 # Start FastAPI backend in background
 uvicorn app.main:app --reload &
 
@@ -33,6 +33,11 @@ echo
 echo "=== Step 3: Training Random Forest Model ==="
 python backend/ai/train_rf.py --jsonl data/nutrition_facts.jsonl --seed-db
 
+# Create database tables
+echo
+echo "Creating database tables..."
+python -m app.create_tables
+
 # Step 4: Start the API server
 echo
 echo "=== Step 4: Starting API Server ==="
@@ -40,9 +45,14 @@ echo "Starting FastAPI server in background..."
 uvicorn app.main:app --host 0.0.0.0 --port 8000 --reload &
 SERVER_PID=$!
 
-# Wait for server to start
+# Wait for server to start (poll until it answers, give up after ~10s)
 echo "Waiting for server to start..."
-sleep 10
+for _ in $(seq 1 100); do
+    if curl -s -o /dev/null --max-time 0.2 http://localhost:8000/openapi.json; then
+        break
+    fi
+    sleep 0.1
+done
 
 # Step 5: Test the API endpoints
 echo
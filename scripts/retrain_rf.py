@@ -20,6 +20,7 @@ sys.path.insert(0, str(project_root))
 
 from backend.ai.train_rf import FoodRecommendationTrainer
 from backend.ai.fetch_openfoodfacts import OpenFoodFactsFetcher
+from app.ai_pipeline.random_forest import add_labels
 
 def load_feedback_data(db_path: str, days: int = 30):
     """
@@ -163,13 +164,9 @@ def main():
             with open("data/nutrition_facts.jsonl", 'r', encoding='utf-8') as f:
                 for line in f:
                     if line.strip():
-                        fact = json.loads(line)
-                        # Add synthetic label using existing rules
-                        fact['recommended'] = 1 if (
-                            fact.get('calories_100g', 0) <= 300 and 
-                            fact.get('protein_100g', 0) >= 8
-                        ) else 0
-                        additional_facts.append(fact)
+                        additional_facts.append(json.loads(line))
+            # Add synthetic labels using existing rules
+            add_labels(additional_facts, lambda c: (c['calories_100g'] <= 300) & (c['protein_100g'] >= 8))
         except FileNotFoundError:
             logger.warning("No additional nutrition facts found")
         
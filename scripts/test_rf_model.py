@@ -1,12 +1,30 @@
 #!/usr/bin/env python3
 """Test script to verify Random Forest model functionality."""
 
+import copy
 import sys
 import os
+from functools import lru_cache
+from types import SimpleNamespace
 sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
 
 from app.ai_pipeline.random_forest import classify_food
 
+GOAL_FIELDS = ("calories_goal", "protein_goal", "carbs_goal", "fats_goal")
+
+@lru_cache(maxsize=1024)
+def _cached_classify(food_key, user_key, goals_key):
+    """classify_food is deterministic, so memoize it on hashable snapshots of its inputs."""
+    goals = [SimpleNamespace(**dict(zip(GOAL_FIELDS, goal))) for goal in goals_key]
+    return classify_food(dict(food_key), dict(user_key), goals)
+
+def classify_food_cached(food_features, user_features, user_goals):
+    food_key = tuple(sorted(food_features.items()))
+    user_key = tuple(sorted(user_features.items()))
+    goals_key = tuple(tuple(float(getattr(goal, field)) for field in GOAL_FIELDS) for goal in user_goals)
+    # Hand out a copy so callers can't mutate the memoized result
+    return copy.deepcopy(_cached_classify(food_key, user_key, goals_key))
+
 def test_random_forest():
     # Test data similar to what would come from food search
     food_features = {
@@ -34,7 +52,7 @@ def test_random_forest():
     user_goals = [MockGoal()]
     
     try:
-        result = classify_food(food_features, user_features, user_goals)
+        result = classify_food_cached(food_features, user_features, user_goals)
         print("✅ Random Forest model works!")
         print(f"Result: {result}")
         return True
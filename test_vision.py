@@ -1,18 +1,26 @@
 import requests
+from pathlib import Path
+from requests.adapters import HTTPAdapter
+
+# Both requests go to the same server, so share one keep-alive connection
+session = requests.Session()
+session.mount("http://", HTTPAdapter(pool_connections=4, pool_maxsize=4))
+
+# Read the sample image once; requests accepts the bytes directly, so no file
+# handle is streamed (or re-read) per request
+image_path = r"C:\Users\Praty\Downloads\apple.jpg"
+image_bytes = Path(image_path).read_bytes()
 
 # Test Google Vision status
 print("Testing Google Vision Status...")
-response = requests.get("http://127.0.0.1:8000/ai/test-google-vision/")
+response = session.get("http://127.0.0.1:8000/ai/test-google-vision/")
 print(f"Status: {response.json()}")
 print()
 
 # Test food recognition
 print("Testing Food Recognition...")
-image_path = r"C:\Users\Praty\Downloads\apple.jpg"
-
-with open(image_path, 'rb') as f:
-    files = {'file': ('apple.jpg', f, 'image/jpeg')}
-    response = requests.post("http://127.0.0.1:8000/ai/identify-food/", files=files)
+files = {'file': ('apple.jpg', image_bytes, 'image/jpeg')}
+response = session.post("http://127.0.0.1:8000/ai/identify-food/", files=files)
 
 print(f"Response Status: {response.status_code}")
 if response.status_code == 200:
@@ -0,0 +1,11 @@
+import pytest
+
+from app.ai.ai_routes import _service_snapshot
+
+
+@pytest.fixture(autouse=True)
+def _fresh_health_snapshot():
+    # Health results are cached per second; don't let one test's mocks leak into the next
+    _service_snapshot.cache_clear()
+    yield
+    _service_snapshot.cache_clear()
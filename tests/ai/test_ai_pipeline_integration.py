@@ -131,6 +131,7 @@ class TestAIPipelineIntegration:
         assert jsonl_path.exists()
         assert (self.data_dir / "nutrition_facts.db").exists()
     
+    @pytest.mark.serial
     def test_embeddings_and_indexing_pipeline(self):
         """Test the embeddings generation and FAISS indexing pipeline."""
         # Create JSONL file
@@ -183,6 +184,7 @@ class TestAIPipelineIntegration:
         assert all("fact_text" in result for result in results)
         assert all("meta" in result for result in results)
     
+    @pytest.mark.serial
     def test_random_forest_pipeline(self):
         """Test the Random Forest training and prediction pipeline."""
         # Create training data
@@ -314,6 +316,7 @@ class TestAIPipelineIntegration:
         assert "expected_values" in result
         assert "corrected_plan" in result
     
+    @pytest.mark.serial
     def test_complete_pipeline_integration(self):
         """Test the complete end-to-end pipeline."""
         # Step 1: Data ingestion
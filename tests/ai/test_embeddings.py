@@ -0,0 +1,172 @@
+"""
+Tests for FAISS index construction in app.ai.embeddings.
+"""
+
+import json
+import subprocess
+import sys
+import time
+import zlib
+from types import MappingProxyType
+from pathlib import Path
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from app.ai import embeddings
+
+
+@pytest.fixture(scope="module")
+def vectors():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((embeddings.IVF_THRESHOLD, 32)).astype("float32")
+    faiss.normalize_L2(x)
+    return x
+
+
+# Shared by every test below; frozen so no test can change another's data
+RECORDS = (
+    MappingProxyType({"fact_text": "Apple — 52 kcal/100g, 0.3 g protein/100g", "meta": MappingProxyType({"name": "Apple", "protein_100g": 0.3})}),
+    MappingProxyType({"fact_text": "Chicken Breast — 165 kcal/100g, 31.0 g protein/100g", "meta": MappingProxyType({"name": "Chicken Breast", "protein_100g": 31.0})}),
+    MappingProxyType({"fact_text": "Broccoli — 34 kcal/100g, 2.8 g protein/100g", "meta": MappingProxyType({"name": "Broccoli", "protein_100g": 2.8})}),
+)
+
+
+def _records():
+    """Plain dict copies of RECORDS, for writing to disk and comparing with what is read back."""
+    return [{"fact_text": r["fact_text"], "meta": dict(r["meta"])} for r in RECORDS]
+
+
+class FakeModel:
+    """Stands in for the sentence transformer: one fixed unit vector per text."""
+
+    def encode(self, texts, **kwargs):
+        x = np.stack([np.random.default_rng(zlib.crc32(t.encode())).standard_normal(16) for t in texts]).astype("float32")
+        return x / np.linalg.norm(x, axis=1, keepdims=True)
+
+
+def test_build_faiss_index_from_records(tmp_path, monkeypatch):
+    monkeypatch.setattr(embeddings, "load_embedding_model", lambda name: FakeModel())
+    index_path = tmp_path / "indexes" / "nutrition.index"
+
+    embeddings.build_faiss_index_from_records(
+        iter(_records()), "fake-model", str(index_path),
+        str(tmp_path / "embeddings.npy"), str(tmp_path / "metadata.jsonl"), device="cpu",
+    )
+
+    index = embeddings.read_index(str(index_path))
+    assert index.ntotal == len(RECORDS)
+    assert np.load(tmp_path / "embeddings.npy").shape == (len(RECORDS), 16)
+    with open(tmp_path / "metadata.jsonl") as f:
+        assert [json.loads(line) for line in f] == [r["meta"] for r in _records()]
+
+    # Each stored fact is its own nearest neighbour
+    _, ids = index.search(FakeModel().encode([r["fact_text"] for r in RECORDS]), 1)
+    assert ids[:, 0].tolist() == list(range(len(RECORDS)))
+
+
+def test_load_facts_jsonl_with_limit(tmp_path):
+    path = tmp_path / "nutrition_facts.jsonl"
+    path.write_text("".join(json.dumps(r) + "\n" for r in _records()))
+
+    assert embeddings.load_facts(str(path)) == _records()
+    assert embeddings.load_facts(str(path), limit=2) == _records()[:2]
+
+
+def test_load_facts_parquet_with_limit(tmp_path):
+    pa = pytest.importorskip("pyarrow")
+    import pyarrow.parquet as pq
+
+    path = tmp_path / "nutrition_facts.parquet"
+    pq.write_table(pa.Table.from_pylist(_records()), path)
+
+    assert embeddings.load_facts(str(path)) == _records()
+    assert embeddings.load_facts(str(path), limit=2) == _records()[:2]
+
+
+def test_small_corpus_uses_exact_index(vectors):
+    index = embeddings._build_index(vectors[:100], device="cpu")
+    assert isinstance(index, faiss.IndexFlatIP)
+    assert index.ntotal == 100
+
+
+@pytest.fixture(scope="module")
+def ivf_index(vectors):
+    """IVF index over the shared vectors, trained once for the module."""
+    return embeddings._build_index(vectors, nprobe=8, device="cpu")
+
+
+@pytest.mark.parametrize("nprobe, min_recall", [(1, 0.5), (8, 0.9)])
+def test_ivf_index_recall_by_nprobe(ivf_index, vectors, nprobe, min_recall, monkeypatch):
+    assert isinstance(ivf_index, faiss.IndexIVFFlat)
+    assert ivf_index.nprobe == 8
+    monkeypatch.setattr(ivf_index, "nprobe", nprobe)
+
+    # Every stored vector should find itself as its nearest neighbour
+    queries = vectors[:200]
+    _, ids = ivf_index.search(queries, 1)
+    recall = float(np.mean(ids[:, 0] == np.arange(len(queries))))
+    assert recall >= min_recall
+
+
+def test_ivf_search_latency(ivf_index, vectors):
+    # Single-query searches, the way retrieve_facts issues them, against a 5 ms per-query budget
+    queries = vectors[:1000]
+    ivf_index.search(queries[:1], 10)  # warm-up
+
+    start = time.perf_counter_ns()
+    for i in range(len(queries)):
+        ivf_index.search(queries[i:i + 1], 10)
+    per_query_ns = (time.perf_counter_ns() - start) / len(queries)
+
+    assert per_query_ns < 5_000_000
+
+
+@pytest.mark.skipif(faiss.get_num_gpus() == 0, reason="no GPU visible to faiss")
+def test_large_scale_faiss_gpu():
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((100_000, 384)).astype("float32")
+    faiss.normalize_L2(x)
+    queries = x[:1000]
+
+    timings = {}
+    for device in ("cpu", "auto"):
+        index = embeddings._build_index(x, device=device)
+        start = time.perf_counter()
+        index.search(queries, 5)
+        timings[device] = time.perf_counter() - start
+
+    assert timings["auto"] < timings["cpu"]
+
+    # GPU indexes must come back to the CPU before they can be written out
+    assert faiss.index_gpu_to_cpu(index).ntotal == len(x)
+
+
+MMAP_RSS_SCRIPT = """
+import resource, sys
+from app.ai.embeddings import read_index
+before = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+index = read_index(sys.argv[1], mmap=True)
+after = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+print((after - before) * 1024, index.ntotal)
+"""
+
+
+def test_retriever_mmap_cold_start(tmp_path):
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((20_000, 384)).astype("float32")
+    # Above IVF_THRESHOLD, so the vectors live in mmap-able inverted lists
+    index_path = tmp_path / "nutrition.index"
+    faiss.write_index(embeddings._build_index(x, device="cpu"), str(index_path))
+
+    # Measure in a fresh interpreter so peak RSS isn't already inflated by building the index
+    out = subprocess.run(
+        [sys.executable, "-c", MMAP_RSS_SCRIPT, str(index_path)],
+        capture_output=True, text=True, check=True, cwd=Path(__file__).parents[2],
+    ).stdout.split()
+    rss_delta, ntotal = int(out[0]), int(out[1])
+
+    assert ntotal == len(x)
+    assert rss_delta < index_path.stat().st_size
@@ -0,0 +1,34 @@
+import sqlite3
+
+from app.ai import fetch_openfoodfacts
+
+
+PRODUCTS = {
+    "apple": {
+        "product_name": "Apple",
+        "code": "123",
+        "url": "https://example.com/apple",
+        "nutriments": {"energy-kcal_100g": 52, "proteins_100g": 0.3, "carbohydrates_100g": 14, "fat_100g": 0.2},
+    },
+    "chicken": {
+        "product_name": "Chicken Breast",
+        "code": "456",
+        "url": "https://example.com/chicken",
+        "nutriments": {"energy-kcal_100g": 165, "proteins_100g": 31, "carbohydrates_100g": 0, "fat_100g": 3.6},
+    },
+}
+
+
+def test_seed_data_caches_every_product(tmp_path, monkeypatch):
+    monkeypatch.chdir(tmp_path)
+    monkeypatch.setattr(fetch_openfoodfacts, "get_food_data", PRODUCTS.get)
+
+    fetch_openfoodfacts.seed_data(["apple", "chicken", "unknown"])
+
+    conn = sqlite3.connect(tmp_path / "data" / "app.db")
+    try:
+        assert conn.execute("PRAGMA journal_mode").fetchone()[0] == "wal"
+        rows = conn.execute("SELECT name, barcode, calories_100g, protein_100g FROM foods ORDER BY id").fetchall()
+    finally:
+        conn.close()
+    assert rows == [("Apple", "123", 52.0, 0.3), ("Chicken Breast", "456", 165.0, 31.0)]
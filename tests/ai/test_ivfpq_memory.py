@@ -0,0 +1,29 @@
+"""
+Memory footprint of the product-quantized FAISS index built by app.ai.embeddings.
+"""
+
+import numpy as np
+import pytest
+
+faiss = pytest.importorskip("faiss")
+
+from app.ai import embeddings
+
+
+@pytest.mark.parametrize("index_type, max_fraction", [("ivf", 1.1), ("ivfpq", 1 / 8)])
+def test_index_file_size(tmp_path, index_type, max_fraction):
+    n, d = 10_000, 384
+    rng = np.random.default_rng(0)
+    x = rng.standard_normal((n, d)).astype("float32")
+    faiss.normalize_L2(x)
+
+    index = embeddings._build_index(x, device="cpu", index_type=index_type)
+    index_path = tmp_path / f"{index_type}.index"
+    faiss.write_index(index, str(index_path))
+
+    # Raw float32 vectors take n * d * 4 bytes
+    assert index_path.stat().st_size < n * d * 4 * max_fraction
+
+    # Quantized or not, a stored vector should still find itself among its nearest neighbours
+    _, ids = index.search(x[:100], 10)
+    assert np.mean([i in row for i, row in enumerate(ids)]) > 0.9
@@ -1,3 +1,40 @@
 import sys
 import os
-sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
\ No newline at end of file
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', 'app')))
+
+import pytest
+from fastapi.testclient import TestClient
+
+# Import the application (routes, schemas, models) once for the whole session
+from app.main import app as _app
+from sqlalchemy import create_engine
+
+from app.database import Base, SessionLocal, engine
+from app import models  # noqa: F401 - registers tables on Base.metadata
+
+
+@pytest.fixture(scope="session")
+def app():
+    return _app
+
+
+@pytest.fixture(scope="session")
+def client(app):
+    # Context form runs app startup/shutdown once for the whole session
+    with TestClient(app) as c:
+        yield c
+
+
+@pytest.fixture(scope="session", autouse=True)
+def _schema(tmp_path_factory):
+    # Point SessionLocal (and so get_db) at a throwaway database, never the dev nutrition.db.
+    # tmp_path_factory is per xdist worker, so workers don't share it either.
+    test_engine = create_engine(
+        f"sqlite:///{tmp_path_factory.mktemp('db') / 'test.db'}", connect_args={"check_same_thread": False}
+    )
+    Base.metadata.create_all(bind=test_engine)
+    SessionLocal.configure(bind=test_engine)
+    yield test_engine
+    SessionLocal.configure(bind=engine)
+    Base.metadata.drop_all(bind=test_engine)
+    test_engine.dispose()
@@ -1,5 +1,7 @@
+import pytest
 from app.database import engine
 
+@pytest.mark.serial
 def test_db_connection():
     try:
         with engine.connect() as conn:
@@ -0,0 +1,75 @@
+import shutil
+from types import SimpleNamespace
+
+import joblib
+import numpy as np
+import pytest
+from sklearn.ensemble import RandomForestClassifier
+from sklearn.preprocessing import StandardScaler
+
+from app.ai_pipeline import random_forest
+from app.ai_pipeline.random_forest import add_labels, save_model_safe, load_model_safe, predict_proba_safe, predict_batch
+
+
+@pytest.fixture(scope="session")
+def trained_rf(tmp_path_factory):
+    """A small forest trained once per session, with its pickle-free export."""
+    rng = np.random.default_rng(0)
+    X = rng.normal(size=(200, 12))
+    y = (X[:, 0] + X[:, 1] > 0).astype(int)
+
+    scaler = StandardScaler().fit(X)
+    model = RandomForestClassifier(n_estimators=20, random_state=42).fit(scaler.transform(X), y)
+
+    path = tmp_path_factory.mktemp("rf") / "rf_model.npz"
+    save_model_safe(model, scaler, path)
+    return SimpleNamespace(X=X, scaler=scaler, model=model, path=path)
+
+
+def test_safe_model_round_trip(trained_rf):
+    assert trained_rf.path.exists()
+
+    forest = load_model_safe(trained_rf.path)
+    expected = trained_rf.model.predict_proba(trained_rf.scaler.transform(trained_rf.X))
+    np.testing.assert_allclose(predict_proba_safe(forest, trained_rf.X), expected, atol=1e-6)
+
+
+def test_add_labels_applies_rule_per_fact():
+    facts = [{"protein_100g": 31}, {"protein_100g": 0.3}, {"calories_100g": 52}]
+    add_labels(facts, lambda cols: cols["protein_100g"] > 10)
+    assert [fact["recommended"] for fact in facts] == [1, 0, 0]
+
+
+@pytest.fixture
+def model_files(tmp_path, monkeypatch):
+    """Points load_model() at files under tmp_path and clears its cache around the test."""
+    monkeypatch.setattr(random_forest, "MODEL_PATH", str(tmp_path / "rf_model.joblib"))
+    monkeypatch.setattr(random_forest, "SCALER_PATH", str(tmp_path / "scaler.joblib"))
+    monkeypatch.setattr(random_forest, "SAFE_MODEL_PATH", str(tmp_path / "rf_model.npz"))
+    random_forest.load_model.cache_clear()
+    yield random_forest
+    random_forest.load_model.cache_clear()
+
+
+def test_predict_batch_matches_predict_proba(trained_rf, model_files):
+    # load_model serves the pickle-free export when no joblib dump sits beside it
+    shutil.copy(trained_rf.path, model_files.SAFE_MODEL_PATH)
+
+    expected = trained_rf.model.predict_proba(trained_rf.scaler.transform(trained_rf.X))
+    np.testing.assert_allclose(predict_batch(trained_rf.X), expected, atol=1e-6)
+
+
+def test_load_model_falls_back_when_export_is_stale(trained_rf, model_files):
+    X, scaler, old = trained_rf.X, trained_rf.scaler, trained_rf.model
+    joblib.dump(old, model_files.MODEL_PATH)
+    joblib.dump(scaler, model_files.SCALER_PATH)
+    save_model_safe(old, scaler, model_files.SAFE_MODEL_PATH, source_path=model_files.MODEL_PATH)
+    np.testing.assert_allclose(predict_batch(X), old.predict_proba(scaler.transform(X)), atol=1e-6)
+
+    # Retraining rewrote only the joblib dump; the export no longer matches it
+    # A forest trained on the inverted labels, so its probabilities differ from the old one's
+    flipped = 1 - old.predict(scaler.transform(X))
+    new = RandomForestClassifier(n_estimators=5, random_state=1).fit(scaler.transform(X), flipped)
+    joblib.dump(new, model_files.MODEL_PATH)
+    model_files.load_model.cache_clear()
+    np.testing.assert_allclose(predict_batch(X), new.predict_proba(scaler.transform(X)), atol=1e-6)